@@ -17,52 +17,16 @@ Operations:
 - FundTreasury: Add reward tokens to pool (owner only)
 - WithdrawTreasury: Remove reward tokens from pool (owner only)
 
-Compile: opshin build pool_validator_v3.py
+Compile: opshin build -O2 pool_validator_v3.py
 """
 from opshin.prelude import *
 
 
 # =============================================================================
-# DATUM - Contains ALL configuration (no baked-in values)
+# DATUM - PoolDatum comes from v3_datum_types.py
 # =============================================================================
 
-@dataclass
-class PoolDatum(PlutusData):
-    """
-    Pool configuration - stored in pool config UTxO with Pool NFT.
-
-    This datum contains ALL configuration for the pool and platform.
-    No values are baked into the compiled contract.
-    """
-    CONSTR_ID = 0
-
-    # Pool Identity
-    pool_nft_policy: bytes          # 28 bytes - Pool NFT policy
-    pool_nft_name: bytes            # 32 bytes - Pool NFT name
-
-    # Stake/Reward Tokens
-    stake_token_policy: bytes       # 28 bytes
-    stake_token_name: bytes
-    reward_token_policy: bytes      # 28 bytes
-    reward_token_name: bytes
-
-    # Pool Parameters
-    yield_rate: int                 # basis points (500 = 5%)
-    min_stake: int
-    owner: bytes                    # 28 bytes PKH
-    total_staked: int
-
-    # Validator Hashes (for cross-validator communication)
-    staking_validator_hash: bytes   # 28 bytes - where user positions live
-    position_nft_policy_hash: bytes # 28 bytes - policy that mints position NFTs
-
-    # Platform Configuration
-    platform_fee_pkh: bytes         # 28 bytes - fee recipient address
-    deposit_fee_bps: int            # basis points (100 = 1%)
-    burn_address_hash: bytes        # 28 bytes - script address for NFT burns
-
-    # Pool State
-    paused: int                     # 0 = active, 1 = paused (no new stakes)
+from v3_datum_types import *
 
 
 # =============================================================================
@@ -130,39 +94,14 @@ PoolRedeemer = Union[Stake, Unstake, Claim, UpdatePool, ClosePool, FundTreasury,
 # HELPERS
 # =============================================================================
 
-def has_nft(v: Value, policy: bytes, name: bytes) -> bool:
-    """Check if value contains the NFT."""
-    if policy in v.keys():
-        tokens = v[policy]
-        if name in tokens.keys():
-            return tokens[name] >= 1
-    return False
-
-
 def get_token_amount(v: Value, policy: bytes, name: bytes) -> int:
-    """Get token amount from value."""
-    if policy in v.keys():
-        tokens = v[policy]
-        if name in tokens.keys():
-            return tokens[name]
-    return 0
-
-
-def signed_by(tx: TxInfo, pkh: bytes) -> bool:
-    """Check if transaction is signed by PKH."""
-    for s in tx.signatories:
-        if s == pkh:
-            return True
-    return False
+    """Get token amount from value (0 if absent)."""
+    return v.get(policy, {b"": 0}).get(name, 0)
 
 
 def nft_burned(tx: TxInfo, policy: bytes, name: bytes) -> bool:
     """Check if NFT is being burned."""
-    if policy in tx.mint.keys():
-        tokens = tx.mint[policy]
-        if name in tokens.keys():
-            return tokens[name] == -1
-    return False
+    return tx.mint.get(policy, {b"": 0}).get(name, 0) == -1
 
 
 def staking_validator_spent(tx: TxInfo, staking_validator_hash: bytes) -> bool:
@@ -185,17 +124,16 @@ def find_own_input(tx: TxInfo, ref: TxOutRef) -> TxOut:
         if i.out_ref == ref:
             return i.resolved
     assert False, "Own input not found"
-    return tx.inputs[0].resolved
 
 
 def find_continuing_output(tx: TxInfo, addr: Address, policy: bytes, name: bytes) -> TxOut:
     """Find output at same address with pool NFT."""
     for o in tx.outputs:
+        # Cheap address compare first; NFT lookup inlined to skip a call per output
         if o.address == addr:
-            if has_nft(o.value, policy, name):
+            if o.value.get(policy, {b"": 0}).get(name, 0) >= 1:
                 return o
     assert False, "Continuing output not found"
-    return tx.outputs[0]
 
 
 def verify_platform_fee_paid(tx: TxInfo, datum: PoolDatum, fee_amount: int, token_policy: bytes, token_name: bytes) -> bool:
@@ -207,8 +145,7 @@ def verify_platform_fee_paid(tx: TxInfo, datum: PoolDatum, fee_amount: int, toke
         if isinstance(cred, PubKeyCredential):
             # Read fee recipient from datum - NOT baked in
             if cred.credential_hash == datum.platform_fee_pkh:
-                token_amount = get_token_amount(output.value, token_policy, token_name)
-                if token_amount >= fee_amount:
+                if output.value.get(token_policy, {b"": 0}).get(token_name, 0) >= fee_amount:
                     return True
     return False
 
@@ -220,81 +157,52 @@ def calculate_fee(amount: int, fee_bps: int) -> int:
 
 def datum_matches_except_total_staked(new_datum: PoolDatum, datum: PoolDatum, expected_total: int) -> bool:
     """Verify all datum fields match except total_staked which should equal expected_total."""
-    if new_datum.pool_nft_policy != datum.pool_nft_policy:
-        return False
-    if new_datum.pool_nft_name != datum.pool_nft_name:
-        return False
-    if new_datum.stake_token_policy != datum.stake_token_policy:
-        return False
-    if new_datum.stake_token_name != datum.stake_token_name:
-        return False
-    if new_datum.reward_token_policy != datum.reward_token_policy:
-        return False
-    if new_datum.reward_token_name != datum.reward_token_name:
-        return False
-    if new_datum.yield_rate != datum.yield_rate:
-        return False
-    if new_datum.min_stake != datum.min_stake:
-        return False
-    if new_datum.owner != datum.owner:
-        return False
-    if new_datum.total_staked != expected_total:
-        return False
-    if new_datum.staking_validator_hash != datum.staking_validator_hash:
-        return False
-    if new_datum.position_nft_policy_hash != datum.position_nft_policy_hash:
-        return False
-    if new_datum.platform_fee_pkh != datum.platform_fee_pkh:
-        return False
-    if new_datum.deposit_fee_bps != datum.deposit_fee_bps:
-        return False
-    if new_datum.burn_address_hash != datum.burn_address_hash:
-        return False
-    if new_datum.paused != datum.paused:
-        return False
-    return True
+    # One equalsData against the expected datum instead of 16 field compares
+    return new_datum == PoolDatum(
+        pool_nft_policy=datum.pool_nft_policy,
+        pool_nft_name=datum.pool_nft_name,
+        stake_token_policy=datum.stake_token_policy,
+        stake_token_name=datum.stake_token_name,
+        reward_token_policy=datum.reward_token_policy,
+        reward_token_name=datum.reward_token_name,
+        yield_rate=datum.yield_rate,
+        min_stake=datum.min_stake,
+        owner=datum.owner,
+        total_staked=expected_total,
+        staking_validator_hash=datum.staking_validator_hash,
+        position_nft_policy_hash=datum.position_nft_policy_hash,
+        platform_fee_pkh=datum.platform_fee_pkh,
+        deposit_fee_bps=datum.deposit_fee_bps,
+        burn_address_hash=datum.burn_address_hash,
+        paused=datum.paused,
+    )
 
 
 def datum_unchanged(new_datum: PoolDatum, datum: PoolDatum) -> bool:
     """Verify datum is completely unchanged."""
-    return datum_matches_except_total_staked(new_datum, datum, datum.total_staked)
+    return new_datum == datum
 
 
 def datum_matches_except_paused(new_datum: PoolDatum, datum: PoolDatum, expected_paused: int) -> bool:
     """Verify all datum fields match except paused which should equal expected_paused."""
-    if new_datum.pool_nft_policy != datum.pool_nft_policy:
-        return False
-    if new_datum.pool_nft_name != datum.pool_nft_name:
-        return False
-    if new_datum.stake_token_policy != datum.stake_token_policy:
-        return False
-    if new_datum.stake_token_name != datum.stake_token_name:
-        return False
-    if new_datum.reward_token_policy != datum.reward_token_policy:
-        return False
-    if new_datum.reward_token_name != datum.reward_token_name:
-        return False
-    if new_datum.yield_rate != datum.yield_rate:
-        return False
-    if new_datum.min_stake != datum.min_stake:
-        return False
-    if new_datum.owner != datum.owner:
-        return False
-    if new_datum.total_staked != datum.total_staked:
-        return False
-    if new_datum.staking_validator_hash != datum.staking_validator_hash:
-        return False
-    if new_datum.position_nft_policy_hash != datum.position_nft_policy_hash:
-        return False
-    if new_datum.platform_fee_pkh != datum.platform_fee_pkh:
-        return False
-    if new_datum.deposit_fee_bps != datum.deposit_fee_bps:
-        return False
-    if new_datum.burn_address_hash != datum.burn_address_hash:
-        return False
-    if new_datum.paused != expected_paused:
-        return False
-    return True
+    return new_datum == PoolDatum(
+        pool_nft_policy=datum.pool_nft_policy,
+        pool_nft_name=datum.pool_nft_name,
+        stake_token_policy=datum.stake_token_policy,
+        stake_token_name=datum.stake_token_name,
+        reward_token_policy=datum.reward_token_policy,
+        reward_token_name=datum.reward_token_name,
+        yield_rate=datum.yield_rate,
+        min_stake=datum.min_stake,
+        owner=datum.owner,
+        total_staked=datum.total_staked,
+        staking_validator_hash=datum.staking_validator_hash,
+        position_nft_policy_hash=datum.position_nft_policy_hash,
+        platform_fee_pkh=datum.platform_fee_pkh,
+        deposit_fee_bps=datum.deposit_fee_bps,
+        burn_address_hash=datum.burn_address_hash,
+        paused=expected_paused,
+    )
 
 
 # =============================================================================
@@ -321,130 +229,27 @@ def validator(ctx: ScriptContext) -> None:
     own_datum_raw = own_out.datum
     assert isinstance(own_datum_raw, SomeOutputDatum), "Missing inline datum on input"
     datum: PoolDatum = own_datum_raw.datum
+    # Pool NFT identity is used by the NFT check, the close burn check and
+    # the continuing-output lookup; project it out of the datum once
+    pool_nft_policy = datum.pool_nft_policy
+    pool_nft_name = datum.pool_nft_name
 
     # Get redeemer from context (PlutusV3 style)
     redeemer: PoolRedeemer = ctx.redeemer
 
     # CRITICAL: Verify pool NFT is present - this proves datum is trustworthy
-    assert has_nft(own_out.value, datum.pool_nft_policy, datum.pool_nft_name), "Pool NFT not found"
-
-    # ==========================================================================
-    # STAKE - Authorizes position NFT minting for user registration
-    # ==========================================================================
-    if isinstance(redeemer, Stake):
-        # Block new stakes when pool is paused
-        assert datum.paused == 0, "Pool is paused - no new stakes allowed"
-        assert redeemer.amount >= datum.min_stake, "Below minimum stake"
-
-        # Find continuing output with pool NFT
-        cont = find_continuing_output(tx, own_addr, datum.pool_nft_policy, datum.pool_nft_name)
-        cont_datum_raw = cont.datum
-        assert isinstance(cont_datum_raw, SomeOutputDatum), "Missing inline datum"
-        new_datum: PoolDatum = cont_datum_raw.datum
-
-        # Verify datum updated correctly (only total_staked changes)
-        assert datum_matches_except_total_staked(new_datum, datum, datum.total_staked + redeemer.amount), "Datum mismatch"
-
-        # Platform fee on deposits - rate read from datum
-        fee = calculate_fee(redeemer.amount, datum.deposit_fee_bps)
-        assert verify_platform_fee_paid(tx, datum, fee, datum.stake_token_policy, datum.stake_token_name), "Fee not paid"
-
-    # ==========================================================================
-    # UNSTAKE
-    # ==========================================================================
-    elif isinstance(redeemer, Unstake):
-        # CRITICAL: Staking validator must be spent to authorize unstake
-        # This prevents unauthorized draining of stake tokens from pool
-        assert staking_validator_spent(tx, datum.staking_validator_hash), "Staking validator must authorize unstake"
-
-        assert redeemer.amount > 0, "Amount must be positive"
-        assert redeemer.amount <= datum.total_staked, "Exceeds total staked"
-
-        # Find continuing output
-        cont = find_continuing_output(tx, own_addr, datum.pool_nft_policy, datum.pool_nft_name)
-        cont_datum_raw = cont.datum
-        assert isinstance(cont_datum_raw, SomeOutputDatum), "Missing inline datum"
-        new_datum: PoolDatum = cont_datum_raw.datum
-
-        # Verify stake tokens removed
-        old_stake = get_token_amount(own_out.value, datum.stake_token_policy, datum.stake_token_name)
-        new_stake = get_token_amount(cont.value, datum.stake_token_policy, datum.stake_token_name)
-        assert old_stake >= new_stake + redeemer.amount, "Stake tokens not removed"
-
-        # Verify datum updated
-        assert datum_matches_except_total_staked(new_datum, datum, datum.total_staked - redeemer.amount), "Datum mismatch"
-
-        # Withdrawals are FREE - no platform fee
-
-    # ==========================================================================
-    # CLAIM
-    # ==========================================================================
-    elif isinstance(redeemer, Claim):
-        # CRITICAL: Staking validator must be spent to authorize claim
-        # This prevents unauthorized draining of reward tokens from pool
-        assert staking_validator_spent(tx, datum.staking_validator_hash), "Staking validator must authorize claim"
-
-        # Find continuing output
-        cont = find_continuing_output(tx, own_addr, datum.pool_nft_policy, datum.pool_nft_name)
-        cont_datum_raw = cont.datum
-        assert isinstance(cont_datum_raw, SomeOutputDatum), "Missing inline datum"
-        new_datum: PoolDatum = cont_datum_raw.datum
-
-        # Verify reward tokens sent (some left pool)
-        old_rewards = get_token_amount(own_out.value, datum.reward_token_policy, datum.reward_token_name)
-        new_rewards = get_token_amount(cont.value, datum.reward_token_policy, datum.reward_token_name)
-        assert old_rewards > new_rewards, "No rewards claimed"
-
-        # Datum must remain unchanged for claim
-        assert datum_unchanged(new_datum, datum), "Datum changed"
-
-        # Claims are FREE - no platform fee
-
-    # ==========================================================================
-    # UPDATE POOL (owner only)
-    # ==========================================================================
-    elif isinstance(redeemer, UpdatePool):
-        # Owner must sign
-        assert signed_by(tx, datum.owner), "Owner signature required"
-
-        # New rate must be valid
-        assert redeemer.new_yield_rate > 0, "Rate must be positive"
-        assert redeemer.new_yield_rate <= 10000, "Rate exceeds maximum"
-
-        # Find continuing output
-        cont = find_continuing_output(tx, own_addr, datum.pool_nft_policy, datum.pool_nft_name)
-        cont_datum_raw = cont.datum
-        assert isinstance(cont_datum_raw, SomeOutputDatum), "Missing inline datum"
-        new_datum: PoolDatum = cont_datum_raw.datum
-
-        # Only yield_rate can change - verify all other fields
-        assert new_datum.pool_nft_policy == datum.pool_nft_policy
-        assert new_datum.pool_nft_name == datum.pool_nft_name
-        assert new_datum.stake_token_policy == datum.stake_token_policy
-        assert new_datum.stake_token_name == datum.stake_token_name
-        assert new_datum.reward_token_policy == datum.reward_token_policy
-        assert new_datum.reward_token_name == datum.reward_token_name
-        assert new_datum.yield_rate == redeemer.new_yield_rate
-        assert new_datum.min_stake == datum.min_stake
-        assert new_datum.owner == datum.owner
-        assert new_datum.total_staked == datum.total_staked
-        assert new_datum.staking_validator_hash == datum.staking_validator_hash
-        assert new_datum.position_nft_policy_hash == datum.position_nft_policy_hash
-        assert new_datum.platform_fee_pkh == datum.platform_fee_pkh
-        assert new_datum.deposit_fee_bps == datum.deposit_fee_bps
-        assert new_datum.burn_address_hash == datum.burn_address_hash
-        assert new_datum.paused == datum.paused
+    assert own_out.value.get(pool_nft_policy, {b"": 0}).get(pool_nft_name, 0) >= 1, "Pool NFT not found"
 
     # ==========================================================================
     # CLOSE POOL (owner only)
     # ==========================================================================
-    elif isinstance(redeemer, ClosePool):
-        # Owner must sign
-        assert signed_by(tx, datum.owner), "Owner signature required"
-
+    if isinstance(redeemer, ClosePool):
         # Pool must be paused before closing
         assert datum.paused == 1, "Pool must be paused before closing"
 
+        # Owner must sign
+        assert datum.owner in tx.signatories, "Owner signature required"
+
         # NOTE: We don't check total_staked == 0 here because:
         # 1. The staking validator independently tracks positions
         # 2. If all position UTxOs are gone, there are no stakers
@@ -452,82 +257,155 @@ def validator(ctx: ScriptContext) -> None:
         # The important thing is that Pool NFT is burned, making the pool unusable
 
         # Pool NFT must be burned (prevents reuse)
-        assert nft_burned(tx, datum.pool_nft_policy, datum.pool_nft_name), "Pool NFT must be burned"
+        assert nft_burned(tx, pool_nft_policy, pool_nft_name), "Pool NFT must be burned"
 
         # No continuing output required - pool is closed
 
-    # ==========================================================================
-    # FUND TREASURY (owner only)
-    # ==========================================================================
-    elif isinstance(redeemer, FundTreasury):
-        # Owner must sign
-        assert signed_by(tx, datum.owner), "Owner signature required"
-
-        # Amount must be positive
-        assert redeemer.amount > 0, "Amount must be positive"
-
-        # Find continuing output with pool NFT
-        cont = find_continuing_output(tx, own_addr, datum.pool_nft_policy, datum.pool_nft_name)
-        cont_datum_raw = cont.datum
-        assert isinstance(cont_datum_raw, SomeOutputDatum), "Missing inline datum"
-        new_datum: PoolDatum = cont_datum_raw.datum
-
-        # Verify reward tokens added
-        old_rewards = get_token_amount(own_out.value, datum.reward_token_policy, datum.reward_token_name)
-        new_rewards = get_token_amount(cont.value, datum.reward_token_policy, datum.reward_token_name)
-        assert new_rewards >= old_rewards + redeemer.amount, "Reward tokens not added"
-
-        # Datum must remain unchanged
-        assert datum_unchanged(new_datum, datum), "Datum changed"
-
-        # Platform fee on treasury funding - rate read from datum
-        fee = calculate_fee(redeemer.amount, datum.deposit_fee_bps)
-        assert verify_platform_fee_paid(tx, datum, fee, datum.reward_token_policy, datum.reward_token_name), "Fee not paid"
-
-    # ==========================================================================
-    # WITHDRAW TREASURY (owner only)
-    # ==========================================================================
-    elif isinstance(redeemer, WithdrawTreasury):
-        # Owner must sign
-        assert signed_by(tx, datum.owner), "Owner signature required"
-
-        # Amount must be positive
-        assert redeemer.amount > 0, "Amount must be positive"
-
-        # Find continuing output with pool NFT
-        cont = find_continuing_output(tx, own_addr, datum.pool_nft_policy, datum.pool_nft_name)
-        cont_datum_raw = cont.datum
-        assert isinstance(cont_datum_raw, SomeOutputDatum), "Missing inline datum"
-        new_datum: PoolDatum = cont_datum_raw.datum
-
-        # Verify reward tokens removed
-        old_rewards = get_token_amount(own_out.value, datum.reward_token_policy, datum.reward_token_name)
-        new_rewards = get_token_amount(cont.value, datum.reward_token_policy, datum.reward_token_name)
-        assert old_rewards >= new_rewards + redeemer.amount, "Reward tokens not removed"
-
-        # Datum must remain unchanged
-        assert datum_unchanged(new_datum, datum), "Datum changed"
-
-        # Treasury withdrawals are FREE - no platform fee
-
-    # ==========================================================================
-    # PAUSE POOL (owner only)
-    # ==========================================================================
-    elif isinstance(redeemer, PausePool):
-        # Owner must sign
-        assert signed_by(tx, datum.owner), "Owner signature required"
-
-        # Validate pause value (must be 0 or 1)
-        assert redeemer.pause == 0 or redeemer.pause == 1, "Pause must be 0 or 1"
-
-        # Find continuing output with pool NFT
-        cont = find_continuing_output(tx, own_addr, datum.pool_nft_policy, datum.pool_nft_name)
+    else:
+        # Every other redeemer keeps the pool alive: find the continuing
+        # output and its datum once, then each branch checks only its delta
+        cont = find_continuing_output(tx, own_addr, pool_nft_policy, pool_nft_name)
         cont_datum_raw = cont.datum
         assert isinstance(cont_datum_raw, SomeOutputDatum), "Missing inline datum"
         new_datum: PoolDatum = cont_datum_raw.datum
 
-        # Verify only paused field changes, all others remain same
-        assert datum_matches_except_paused(new_datum, datum, redeemer.pause), "Only paused field can change"
-
-    else:
-        assert False, "Invalid redeemer"
+        # ======================================================================
+        # STAKE - Authorizes position NFT minting for user registration
+        # ======================================================================
+        if isinstance(redeemer, Stake):
+            # Block new stakes when pool is paused
+            assert datum.paused == 0, "Pool is paused - no new stakes allowed"
+            assert redeemer.amount >= datum.min_stake, "Below minimum stake"
+
+            # Verify datum updated correctly (only total_staked changes)
+            assert datum_matches_except_total_staked(new_datum, datum, datum.total_staked + redeemer.amount), "Datum mismatch"
+
+            # Platform fee on deposits - rate read from datum
+            assert verify_platform_fee_paid(tx, datum, calculate_fee(redeemer.amount, datum.deposit_fee_bps), datum.stake_token_policy, datum.stake_token_name), "Fee not paid"
+
+        # ======================================================================
+        # CLAIM
+        # ======================================================================
+        elif isinstance(redeemer, Claim):
+            # CRITICAL: Staking validator must be spent to authorize claim
+            # This prevents unauthorized draining of reward tokens from pool
+            assert staking_validator_spent(tx, datum.staking_validator_hash), "Staking validator must authorize claim"
+
+            # Verify reward tokens sent (some left pool)
+            old_rewards = get_token_amount(own_out.value, datum.reward_token_policy, datum.reward_token_name)
+            new_rewards = get_token_amount(cont.value, datum.reward_token_policy, datum.reward_token_name)
+            assert old_rewards > new_rewards, "No rewards claimed"
+
+            # Datum must remain unchanged for claim
+            assert datum_unchanged(new_datum, datum), "Datum changed"
+
+            # Claims are FREE - no platform fee
+
+        # ======================================================================
+        # UNSTAKE
+        # ======================================================================
+        elif isinstance(redeemer, Unstake):
+            # CRITICAL: Staking validator must be spent to authorize unstake
+            # This prevents unauthorized draining of stake tokens from pool
+            assert staking_validator_spent(tx, datum.staking_validator_hash), "Staking validator must authorize unstake"
+
+            assert redeemer.amount > 0, "Amount must be positive"
+            assert redeemer.amount <= datum.total_staked, "Exceeds total staked"
+
+            # Verify stake tokens removed
+            old_stake = get_token_amount(own_out.value, datum.stake_token_policy, datum.stake_token_name)
+            new_stake = get_token_amount(cont.value, datum.stake_token_policy, datum.stake_token_name)
+            assert old_stake >= new_stake + redeemer.amount, "Stake tokens not removed"
+
+            # Verify datum updated
+            assert datum_matches_except_total_staked(new_datum, datum, datum.total_staked - redeemer.amount), "Datum mismatch"
+
+            # Withdrawals are FREE - no platform fee
+
+        # ======================================================================
+        # FUND TREASURY (owner only)
+        # ======================================================================
+        elif isinstance(redeemer, FundTreasury):
+            # Amount must be positive
+            assert redeemer.amount > 0, "Amount must be positive"
+
+            # Owner must sign
+            assert datum.owner in tx.signatories, "Owner signature required"
+
+            # Verify reward tokens added
+            old_rewards = get_token_amount(own_out.value, datum.reward_token_policy, datum.reward_token_name)
+            new_rewards = get_token_amount(cont.value, datum.reward_token_policy, datum.reward_token_name)
+            assert new_rewards >= old_rewards + redeemer.amount, "Reward tokens not added"
+
+            # Datum must remain unchanged
+            assert datum_unchanged(new_datum, datum), "Datum changed"
+
+            # Platform fee on treasury funding - rate read from datum
+            assert verify_platform_fee_paid(tx, datum, calculate_fee(redeemer.amount, datum.deposit_fee_bps), datum.reward_token_policy, datum.reward_token_name), "Fee not paid"
+
+        # ======================================================================
+        # WITHDRAW TREASURY (owner only)
+        # ======================================================================
+        elif isinstance(redeemer, WithdrawTreasury):
+            # Amount must be positive
+            assert redeemer.amount > 0, "Amount must be positive"
+
+            # Owner must sign
+            assert datum.owner in tx.signatories, "Owner signature required"
+
+            # Verify reward tokens removed
+            old_rewards = get_token_amount(own_out.value, datum.reward_token_policy, datum.reward_token_name)
+            new_rewards = get_token_amount(cont.value, datum.reward_token_policy, datum.reward_token_name)
+            assert old_rewards >= new_rewards + redeemer.amount, "Reward tokens not removed"
+
+            # Datum must remain unchanged
+            assert datum_unchanged(new_datum, datum), "Datum changed"
+
+            # Treasury withdrawals are FREE - no platform fee
+
+        # ======================================================================
+        # UPDATE POOL (owner only)
+        # ======================================================================
+        elif isinstance(redeemer, UpdatePool):
+            # New rate must be valid
+            assert redeemer.new_yield_rate > 0, "Rate must be positive"
+            assert redeemer.new_yield_rate <= 10000, "Rate exceeds maximum"
+
+            # Owner must sign
+            assert datum.owner in tx.signatories, "Owner signature required"
+
+            # Only yield_rate can change - verify all other fields
+            assert new_datum == PoolDatum(
+                pool_nft_policy=datum.pool_nft_policy,
+                pool_nft_name=datum.pool_nft_name,
+                stake_token_policy=datum.stake_token_policy,
+                stake_token_name=datum.stake_token_name,
+                reward_token_policy=datum.reward_token_policy,
+                reward_token_name=datum.reward_token_name,
+                yield_rate=redeemer.new_yield_rate,
+                min_stake=datum.min_stake,
+                owner=datum.owner,
+                total_staked=datum.total_staked,
+                staking_validator_hash=datum.staking_validator_hash,
+                position_nft_policy_hash=datum.position_nft_policy_hash,
+                platform_fee_pkh=datum.platform_fee_pkh,
+                deposit_fee_bps=datum.deposit_fee_bps,
+                burn_address_hash=datum.burn_address_hash,
+                paused=datum.paused,
+            ), "Only yield_rate can change"
+
+        # ======================================================================
+        # PAUSE POOL (owner only)
+        # ======================================================================
+        elif isinstance(redeemer, PausePool):
+            # Validate pause value (must be 0 or 1)
+            assert redeemer.pause == 0 or redeemer.pause == 1, "Pause must be 0 or 1"
+
+            # Owner must sign
+            assert datum.owner in tx.signatories, "Owner signature required"
+
+            # Verify only paused field changes, all others remain same
+            assert datum_matches_except_paused(new_datum, datum, redeemer.pause), "Only paused field can change"
+
+        else:
+            assert False, "Invalid redeemer"